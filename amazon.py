@@ -0,0 +1,349 @@
+import atexit
+import csv
+import gzip
+import io
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+import lxml.html
+from lxml.cssselect import CSSSelector
+import browser
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+import logging
+
+from config import DATABASE_CONFIG, SCRAPING_CONFIG
+
+# Compiled once; lxml would otherwise re-translate the CSS to XPath per call
+_SEL_RESULT = CSSSelector("div[data-component-type='s-search-result']")
+_SEL_TITLE = CSSSelector("h2 a span")
+_SEL_PRICE = CSSSelector(".a-price-whole")
+# The offscreen child holds the price once; the container's text_content()
+# concatenates it with the aria-hidden visible duplicate ("$999.99$999.99")
+_SEL_ORIGINAL_PRICE = CSSSelector(".a-price.a-text-price .a-offscreen")
+_SEL_RATING = CSSSelector(".a-icon-alt")
+_SEL_REVIEW_COUNT = CSSSelector(".a-size-base")
+_SEL_AMOUNT_BOUGHT = CSSSelector(".a-size-base.a-color-secondary")
+_RESULT_CARD_LOCATOR = (By.CSS_SELECTOR, "div[data-component-type='s-search-result']")
+
+
+def _page_urls(search_url: str, max_pages: int) -> List[str]:
+    """Build canonical page URLs by merging page into the query string.
+
+    Appending "&page=N" blindly breaks when the URL has no query yet, and
+    Amazon answers the malformed URL with a redirect costing an extra RTT.
+    """
+    scheme, netloc, path, query, fragment = urlsplit(search_url)
+    params = dict(parse_qsl(query))
+    urls = []
+    for page in range(1, max_pages + 1):
+        params["page"] = page
+        urls.append(urlunsplit((scheme, netloc, path, urlencode(params), fragment)))
+    return urls
+
+_PRICE_TBL = str.maketrans('', '', '$,')
+_NON_DIGITS_TBL = str.maketrans('', '', ''.join(ch for ch in map(chr, range(256)) if not ch.isdigit()))
+
+
+class AmazonScraper:
+    def __init__(self, db_config: Dict[str, str]):
+        self.db_config = db_config
+        self._db_pool = None
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s: %(message)s")
+        self.logger = logging.getLogger(__name__)
+        # Search result pages are server-rendered, so fetch them over plain
+        # HTTP by default and only fall back to a browser when dynamic=True.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Connection": "keep-alive",
+        })
+
+    def _get_db_pool(self) -> ThreadedConnectionPool:
+        """Create the database connection pool on first use."""
+        if self._db_pool is None:
+            # Keepalives stop NAT/idle timeouts from silently killing the
+            # warm sockets between save phases
+            self._db_pool = ThreadedConnectionPool(
+                1, 8,
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=3,
+                application_name="amazon-scraper",
+                **self.db_config,
+            )
+            # Close the warm connections even if close() is never called
+            atexit.register(self._db_pool.closeall)
+        return self._db_pool
+
+    def close(self):
+        """Release the pooled HTTP and database connections."""
+        self.session.close()
+        if self._db_pool is not None:
+            # Drop the exit hook too, or it would re-close the pool (raising
+            # PoolError) and stack up if a later save builds a fresh pool
+            atexit.unregister(self._db_pool.closeall)
+            self._db_pool.closeall()
+            self._db_pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fetch_html(self, url: str) -> str:
+        """Fetch a page over plain HTTP, reusing the pooled session socket."""
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        return response.text
+
+    def _parse_page(self, tree) -> List[Dict]:
+        """Parse one search result page into product dicts."""
+        product_elements = _SEL_RESULT(tree)
+        self.logger.info(f"Found {len(product_elements)} products")
+        page_products = []
+        for product_element in product_elements:
+            try:
+                page_products.append(self._extract_product_details(product_element))
+            except Exception as e:
+                self.logger.warning("Error extracting product details: %s", e)
+        return page_products
+
+    def _scrape_page(self, url: str) -> List[Dict]:
+        """Fetch and parse a single search result page over HTTP."""
+        # Small jitter so concurrent workers don't hit Amazon in lockstep
+        time.sleep(random.uniform(0.1, 0.6))
+        self.logger.info(f"Scraping URL: {url}")
+        return self._parse_page(lxml.html.fromstring(self._fetch_html(url)))
+
+    def _iter_pages(self, search_url: str, max_pages: int = 5, dynamic: bool = False):
+        """Yield each result page's products as soon as it is scraped."""
+        urls = _page_urls(search_url, max_pages)
+
+        try:
+            if dynamic:
+                driver = browser.get_driver()
+                try:
+                    for url in urls:
+                        self.logger.info(f"Scraping URL: {url}")
+                        driver.get(url)
+                        try:
+                            # One sentinel card is enough; page_source grabs the rest
+                            WebDriverWait(driver, 20).until(
+                                EC.presence_of_element_located(_RESULT_CARD_LOCATOR)
+                            )
+                        except TimeoutException:
+                            self.logger.warning(f"Timed out waiting for results on {url}")
+                            continue
+                        page_products = self._parse_page(lxml.html.fromstring(driver.page_source))
+                        if not page_products:
+                            self.logger.info(f"No more results at {url}")
+                            break
+                        yield page_products
+                finally:
+                    browser.reset_driver()
+            else:
+                # Each page blocks mostly on network RTT, so overlap the fetches
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    first_title = None
+                    for page_products in executor.map(self._scrape_page, urls):
+                        # Past the last real page Amazon serves an empty page or
+                        # loops back to page 1; discard everything from there on
+                        if not page_products:
+                            self.logger.info("Empty result page; stopping")
+                            break
+                        if first_title is None:
+                            first_title = page_products[0]['title']
+                        elif page_products[0]['title'] == first_title:
+                            self.logger.info("Result pages wrapped around; stopping")
+                            break
+                        yield page_products
+        except Exception as e:
+            self.logger.error(f"Scraping failed: {e}")
+
+    def scrape_amazon_products(self, search_url: str, max_pages: int = 5, dynamic: bool = False) -> List[Dict]:
+        products = []
+        for page_products in self._iter_pages(search_url, max_pages, dynamic):
+            products.extend(page_products)
+        return products
+
+    def scrape_and_save(self, search_url: str, max_pages: int = 5, category: str = "laptops",
+                        dynamic: bool = False) -> List[Dict]:
+        """Scrape pages while a writer thread saves finished batches.
+
+        Inserting overlaps with scraping, so the end-to-end time tends to
+        max(scrape, insert) instead of their sum.
+        """
+        batch_queue = queue.Queue(maxsize=500)
+
+        def _writer():
+            while True:
+                batch = batch_queue.get()
+                if batch is None:
+                    return
+                self.save_to_database(batch, category)
+
+        writer = threading.Thread(target=_writer, daemon=True)
+        writer.start()
+
+        products = []
+        for page_products in self._iter_pages(search_url, max_pages, dynamic):
+            batch_queue.put(page_products)
+            products.extend(page_products)
+        batch_queue.put(None)
+        writer.join()
+        return products
+
+    def _extract_product_details(self, product_element) -> Dict:
+        """Extract product details from a single search result card."""
+        def safe_find_text(selector, default="N/A"):
+            matches = selector(product_element)
+            # Coerce empty text to the default here so no later stage renormalizes
+            return (matches[0].text_content().strip() or default) if matches else default
+
+        title = safe_find_text(_SEL_TITLE)
+        current_price_text = safe_find_text(_SEL_PRICE)
+        original_price_text = safe_find_text(_SEL_ORIGINAL_PRICE)
+        rating_text = safe_find_text(_SEL_RATING)
+        review_count_text = safe_find_text(_SEL_REVIEW_COUNT, default="0")
+        amount_bought_raw = safe_find_text(_SEL_AMOUNT_BOUGHT)
+
+        # Convert prices to float, if they exist
+        try:
+            original_price = float(original_price_text.translate(_PRICE_TBL)) if original_price_text != "N/A" else None
+        except ValueError:
+            original_price = None
+        try:
+            current_price = float(current_price_text.translate(_PRICE_TBL)) if current_price_text != "N/A" else None
+        except ValueError:
+            current_price = None
+        if current_price is None:
+            current_price = 0
+
+        try:
+            rating_value = float(rating_text.split()[0]) if rating_text != "N/A" else None
+        except (ValueError, IndexError):
+            rating_value = None
+        try:
+            review_count_value = int(review_count_text.replace(',', '')) if review_count_text != "N/A" else 0
+        except (ValueError, TypeError):
+            review_count_value = 0
+
+        discount = None
+        if original_price is not None and current_price is not None:
+            discount = int(original_price - current_price)
+
+        amount_bought = amount_bought_raw.split('+')[0].strip() if '+' in amount_bought_raw else amount_bought_raw
+        try:
+            amount_bought = int(amount_bought.translate(_NON_DIGITS_TBL))
+        except ValueError:
+            amount_bought = 0
+
+        return {
+            'title': title,
+            'price': current_price,
+            'discount': discount if discount is not None else "N/A",
+            'rating': rating_value,
+            'review_count': review_count_value,
+            'amount_bought': amount_bought or "N/A",
+        }
+
+    def save_to_database(self, products: List[Dict], category: str = "laptops"):
+        """Save products to PostgreSQL with transaction management."""
+        try:
+            pool = self._get_db_pool()
+            connection = pool.getconn()
+            try:
+                # One transaction for the whole batch; skipping the WAL flush
+                # wait only risks the last transaction of scraped data
+                connection.autocommit = False
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL synchronous_commit = off")
+                    rows = []
+                    skipped = 0
+                    for product in products:
+                        if product['title'] == "N/A":
+                            # Lazy formatting: skipped entirely at INFO level
+                            self.logger.debug("Skipping invalid product: %s", product)
+                            skipped += 1
+                            continue  # Skip this product
+
+                        rows.append((
+                            product['title'],
+                            product['price'],
+                            product['discount'],
+                            product['rating'],
+                            product['review_count'],
+                            product['amount_bought'],
+                            category,
+                        ))
+
+                    # COPY streams every row in one protocol message,
+                    # skipping per-statement parse/plan entirely
+                    buffer = io.StringIO()
+                    csv.writer(buffer).writerows(rows)
+                    buffer.seek(0)
+                    cursor.copy_expert(
+                        """COPY products (title, price, discount, rating,
+                        review_count, amount_bought, category) FROM STDIN WITH (FORMAT csv)""",
+                        buffer,
+                    )
+                connection.commit()
+                if skipped:
+                    self.logger.info("Skipped %d invalid products", skipped)
+                self.logger.info(f"Successfully saved {len(rows)} products to database")
+            finally:
+                pool.putconn(connection)
+        except psycopg2.Error as e:
+            self.logger.error(f"Database error: {e}")
+
+    def save_to_csv(self, products: List[Dict], filename: str = "amazon_products.csv"):
+        """Save products to CSV with error handling."""
+        try:
+            fieldnames = ['title', 'price', 'discount', 'rating', 'review_count', 'amount_bought']
+            if filename.endswith(".gz"):
+                # Level 1 keeps compression cheap while still shrinking the file
+                csv_file = gzip.open(filename, "wt", compresslevel=1, newline="")
+            else:
+                csv_file = open(filename, "w", newline="")
+            with csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(products)
+            self.logger.info(f"Products saved to CSV file: {filename}")
+        except Exception as e:
+            self.logger.error(f"CSV export failed: {e}")
+
+
+def main():
+    scraper = AmazonScraper(DATABASE_CONFIG)
+
+    products = scraper.scrape_and_save(
+        SCRAPING_CONFIG["category_url"],
+        SCRAPING_CONFIG["max_pages"],
+    )
+    scraper.save_to_csv(products)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Shared headless Chrome management for the scrapers.
+
+Booting Chrome and resolving the chromedriver binary cost seconds, so the
+driver is created lazily once per process and reused across scrape runs
+instead of being launched per scraper invocation.
+"""
+import atexit
+import functools
+import threading
+import urllib3
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+_DRIVER = None
+_DRIVER_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _driver_path() -> str:
+    """Resolve the chromedriver binary once per process.
+
+    ChromeDriverManager().install() performs a version check over the
+    network, so relaunching the browser should not pay it again.
+    """
+    return ChromeDriverManager().install()
+
+
+def _build_options() -> Options:
+    """Configure Chrome webdriver with optimal settings."""
+    options = Options()
+    # Return from driver.get on DOMContentLoaded; we never wait for sub-resources
+    options.page_load_strategy = "eager"
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    options.add_argument("--disable-gpu")
+    # Strip subsystems the scrapers never use; keeps steady-state RSS down
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-sync")
+    # The scrapers only read the HTML, so skip downloading heavy resources
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    return options
+
+
+def get_driver() -> webdriver.Chrome:
+    """Return the process-wide driver, launching it on first use."""
+    global _DRIVER
+    with _DRIVER_LOCK:
+        if _DRIVER is None:
+            service = Service(_driver_path())
+            _DRIVER = webdriver.Chrome(service=service, options=_build_options())
+            _DRIVER.set_page_load_timeout(60)
+            # Explicit waits only; a non-zero implicit wait would compound them
+            _DRIVER.implicitly_wait(0)
+            # The command channel defaults to a single-connection urllib3 pool;
+            # widen it so a second thread issuing a driver command is not dropped
+            _DRIVER.command_executor._conn = urllib3.PoolManager(num_pools=4, maxsize=10)
+            atexit.register(close_driver)
+    return _DRIVER
+
+
+def reset_driver():
+    """Clear browser state between runs instead of paying a fresh boot."""
+    if _DRIVER is not None:
+        _DRIVER.delete_all_cookies()
+        _DRIVER.get("about:blank")
+
+
+def close_driver():
+    global _DRIVER
+    if _DRIVER is not None:
+        _DRIVER.quit()
+        _DRIVER = None
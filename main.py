@@ -1,69 +1,163 @@
+import atexit
 import time
-import pandas as pd
+import csv
+import gzip
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import requests
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
+import browser
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 import logging
 import re
 import uuid
 
+_REVIEW_COUNT_RE = re.compile(r'\((\d+)\)')
+_RATING_RE = re.compile(r'(\d+\.\d+)')
+
+# Hoisted so the per-product loop reuses the same selector objects
+_SEL_PRODUCT = "article.prd"
+_SEL_NAME = ".info h3.name"
+_SEL_PRICE = ".info .prc"
+_SEL_OLD_PRICE = ".info .old"
+_SEL_DISCOUNT = ".info .s-prc-w .bdg._dsct._sm"
+_SEL_RATING = ".info .stars._s"
+_SEL_REVIEWS = ".info .rev"
+
 class Scraper:
     def __init__(self, db_config: Dict[str, str]):
         self.db_config = db_config
+        self._db_pool = None
         logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s: %(message)s")
         self.logger = logging.getLogger(__name__)
+        # Plain HTTP session for the listing pages; they render server-side,
+        # so a browser is only needed when dynamic=True is requested.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Connection": "keep-alive",
+        })
 
-    def _setup_webdriver(self) -> webdriver.Chrome:
-        """Configure Chrome webdriver with optimal settings."""
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(60)
-        return driver
+    def _get_db_pool(self) -> ThreadedConnectionPool:
+        """Create the database connection pool on first use."""
+        if self._db_pool is None:
+            # Keepalives stop NAT/idle timeouts from silently killing the
+            # warm sockets between save phases
+            self._db_pool = ThreadedConnectionPool(
+                1, 8,
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=3,
+                application_name="jumia-scraper",
+                **self.db_config,
+            )
+            # Close the warm connections even if close() is never called
+            atexit.register(self._db_pool.closeall)
+        return self._db_pool
+
+    def close(self):
+        """Release the pooled HTTP and database connections."""
+        self.session.close()
+        if self._db_pool is not None:
+            # Drop the exit hook too, or it would re-close the pool (raising
+            # PoolError) and stack up if a later save builds a fresh pool
+            atexit.unregister(self._db_pool.closeall)
+            self._db_pool.closeall()
+            self._db_pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def scrape_jumia_products(self, category_url: str, max_pages: int = 10) -> List[Dict]:
+    def _fetch_html(self, url: str) -> str:
+        """Fetch a page over plain HTTP, reusing the pooled session socket."""
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        return response.text
+
+    def _parse_page(self, soup) -> List[Dict]:
+        """Parse one listing page into product dicts."""
+        product_elements = soup.select(_SEL_PRODUCT)
+        self.logger.info(f"Found {len(product_elements)} products")
+        page_products = []
+        for product_element in product_elements:
+            try:
+                page_products.append(self._extract_product_details_bs(product_element))
+            except Exception as e:
+                self.logger.warning("Error extracting product details: %s", e)
+        return page_products
+
+    def _scrape_page(self, url: str) -> List[Dict]:
+        """Fetch and parse a single listing page over HTTP."""
+        self.logger.info(f"Scraping URL: {url}")
+        return self._parse_page(BeautifulSoup(self._fetch_html(url), "lxml"))
+
+    def scrape_jumia_products(self, category_url: str, max_pages: int = 10, dynamic: bool = False) -> List[Dict]:
+        urls = [f"{category_url}?page={page}#catalog-listing" for page in range(1, max_pages + 1)]
         products = []
-        driver = self._setup_webdriver()
 
         try:
-            for page in range(1, max_pages + 1):
-                url = f"{category_url}?page={page}#catalog-listing"
-                self.logger.info(f"Scraping URL: {url}")
-                driver.get(url)
-                driver.implicitly_wait(30)  # Allow time for dynamic content to load
-
-                # Extract page source and parse it with Beautiful Soup
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                product_elements = soup.select("article.prd")  # Adjust selector if necessary
-                self.logger.info(f"Found {len(product_elements)} products on page {page}")
-
-                for product_element in product_elements:
-                    try:
-                        product_data = self._extract_product_details_bs(product_element)
-                        products.append(product_data)
-                    except Exception as e:
-                        self.logger.warning(f"Error extracting product details: {e}")
-
-                # Check if there are more pages available
-                if not soup.select_one(f'a.pg[aria-label="Page {page + 1}"]'):
-                    self.logger.info(f"No more pages after page {page}")
-                    break
+            if dynamic:
+                driver = browser.get_driver()
+                try:
+                    for page, url in enumerate(urls, start=1):
+                        self.logger.info(f"Scraping URL: {url}")
+                        driver.get(url)
+                        # Poll once for the product cards instead of a blanket implicit wait
+                        try:
+                            WebDriverWait(driver, 15).until(
+                                EC.presence_of_element_located((By.CSS_SELECTOR, _SEL_PRODUCT))
+                            )
+                        except TimeoutException:
+                            self.logger.warning(f"Timed out waiting for products on {url}")
+                            continue
+                        soup = BeautifulSoup(driver.page_source, "lxml")
+                        products.extend(self._parse_page(soup))
 
+                        # Check if there are more pages available
+                        if not soup.select_one(f'a.pg[aria-label="Page {page + 1}"]'):
+                            self.logger.info(f"No more pages after page {page}")
+                            break
+                finally:
+                    browser.reset_driver()
+            else:
+                # Each page blocks mostly on network RTT, so overlap the fetches
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    first_name = None
+                    for page_products in executor.map(self._scrape_page, urls):
+                        # Past the last real page Jumia serves an empty page or
+                        # repeats an earlier one; discard everything from there on
+                        if not page_products:
+                            self.logger.info("Empty result page; stopping")
+                            break
+                        if first_name is None:
+                            first_name = page_products[0]['product_name']
+                        elif page_products[0]['product_name'] == first_name:
+                            self.logger.info("Result pages wrapped around; stopping")
+                            break
+                        products.extend(page_products)
         except Exception as e:
             self.logger.error(f"Scraping failed: {e}")
-        finally:
-            driver.quit()
 
         return products
 
@@ -71,17 +165,18 @@ class Scraper:
         """Extract product details using Beautiful Soup."""
         def safe_find_text_bs(element, selector, default="N/A"):
             target = element.select_one(selector)
-            return target.text.strip() if target else default
+            # Coerce empty text to the default here so no later stage renormalizes
+            return (target.text.strip() or default) if target else default
         def extract_review_count(review_string):
-            match = re.search(r'\((\d+)\)', review_string)
+            match = _REVIEW_COUNT_RE.search(review_string)
             return int(match.group(1)) if match else 0   
         def extract_product_rating(rating_string):
-            match = re.search(r'(\d+\.\d+)', rating_string)  # Match a decimal number
+            match = _RATING_RE.search(rating_string)  # Match a decimal number
             return match.group(1) if match else "N/A"
 
-        reviews_string = safe_find_text_bs(product_element, ".info .rev")  # Assuming this is where the review string is located
+        reviews_string = safe_find_text_bs(product_element, _SEL_REVIEWS)
         review_count = extract_review_count(reviews_string)
-        rating_string = safe_find_text_bs(product_element, ".info .stars._s")  # Assuming this is where the rating string is located
+        rating_string = safe_find_text_bs(product_element, _SEL_RATING)
         product_rating = extract_product_rating(rating_string)
         
         review_to_sale_ratio = 0.1
@@ -89,10 +184,10 @@ class Scraper:
 
 
         return {
-            'product_name': safe_find_text_bs(product_element, ".info h3.name"),
-            'product_price': safe_find_text_bs(product_element, ".info .prc"),
-            'original_price': safe_find_text_bs(product_element, ".info .old"),
-            'discount_percentage': safe_find_text_bs(product_element, ".info .s-prc-w .bdg._dsct._sm"),
+            'product_name': safe_find_text_bs(product_element, _SEL_NAME),
+            'product_price': safe_find_text_bs(product_element, _SEL_PRICE),
+            'original_price': safe_find_text_bs(product_element, _SEL_OLD_PRICE),
+            'discount_percentage': safe_find_text_bs(product_element, _SEL_DISCOUNT),
             'product_rating': product_rating,
             'reviews_count': review_count,
             'estimated_amount_bought': estimated_amount_bought
@@ -101,38 +196,67 @@ class Scraper:
     def save_to_database(self, products: List[Dict]):
         """Save products to PostgreSQL with transaction management."""
         try:
-            with psycopg2.connect(**self.db_config) as connection:
+            pool = self._get_db_pool()
+            connection = pool.getconn()
+            try:
+                # One transaction for the whole batch; skipping the WAL flush
+                # wait only risks the last transaction of scraped data
+                connection.autocommit = False
                 with connection.cursor() as cursor:
-                    insert_product_query = """INSERT INTO products (product_name, product_price, original_price,
-                    discount_percentage, product_rating, reviews_count) VALUES (%s, %s, %s, %s, %s, %s)"""
-                    
-                    
-
+                    cursor.execute("SET LOCAL synchronous_commit = off")
+                    rows = []
+                    skipped = 0
                     for product in products:
-                      if (product['product_name'] == "N/A" or
-                          product['product_price'] == "N/A" or
-                          product['reviews_count'] == 0):
-                          self.logger.warning(f"Skipping invalid product: {product}")
-                          continue  # Skip this product
-                      
-                      cursor.execute(insert_product_query, (
-                          product['product_name'],
-                          product['product_price'],
-                          product['original_price'],
-                          product['discount_percentage'],
-                          product['product_rating'],
-                          product['reviews_count'],
+                        if (product['product_name'] == "N/A" or
+                            product['product_price'] == "N/A" or
+                            product['reviews_count'] == 0):
+                            # Lazy formatting: skipped entirely at INFO level
+                            self.logger.debug("Skipping invalid product: %s", product)
+                            skipped += 1
+                            continue  # Skip this product
+
+                        rows.append((
+                            product['product_name'],
+                            product['product_price'],
+                            product['original_price'],
+                            product['discount_percentage'],
+                            product['product_rating'],
+                            product['reviews_count'],
                         ))
+
+                    # COPY streams every row in one protocol message,
+                    # skipping per-statement parse/plan entirely
+                    buffer = io.StringIO()
+                    csv.writer(buffer).writerows(rows)
+                    buffer.seek(0)
+                    cursor.copy_expert(
+                        """COPY products (product_name, product_price, original_price,
+                        discount_percentage, product_rating, reviews_count) FROM STDIN WITH (FORMAT csv)""",
+                        buffer,
+                    )
                 connection.commit()
-                self.logger.info(f"Successfully saved {len(products)} products to database")
+                if skipped:
+                    self.logger.info("Skipped %d invalid products", skipped)
+                self.logger.info(f"Successfully saved {len(rows)} products to database")
+            finally:
+                pool.putconn(connection)
         except psycopg2.Error as e:
             self.logger.error(f"Database error: {e}")
 
     def save_to_csv(self, products: List[Dict], filename: str = "jumia_products.csv"):
         """Save products to CSV with error handling."""
         try:
-            products_df = pd.DataFrame(products)
-            products_df.to_csv(filename, index=False)
+            fieldnames = ['product_name', 'product_price', 'original_price', 'discount_percentage',
+                          'product_rating', 'reviews_count', 'estimated_amount_bought']
+            if filename.endswith(".gz"):
+                # Level 1 keeps compression cheap while still shrinking the file
+                csv_file = gzip.open(filename, "wt", compresslevel=1, newline="")
+            else:
+                csv_file = open(filename, "w", newline="")
+            with csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(products)
             self.logger.info(f"Products saved to CSV file: {filename}")
         except Exception as e:
             self.logger.error(f"CSV export failed: {e}")